@@ -0,0 +1,60 @@
+"""Benchmark xrandroll.batch on generated dumps.
+
+Usage: python benchmarks/bench_batch.py [DUMPS] [SCREENS_PER_DUMP]
+
+Dumps are made out of tests/fixtures/sample_1.txt, with each
+X screen's monitors moved around so no two dumps are the same.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from xrandroll import batch  # noqa: E402
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def make_dumps(folder, count, screens):
+    sample = (FIXTURES / "sample_1.txt").read_text()
+    for i in range(count):
+        dump = []
+        for n in range(screens):
+            screen = sample.replace("Screen 0:", f"Screen {n}:")
+            screen = screen.replace("1920x1080+1+0", f"1920x1080+{(i + n) % 1920}+0")
+            dump.append(screen)
+        (folder / f"kiosk-{i:05}.txt").write_text("".join(dump))
+
+
+def bench(paths, jobs):
+    start = time.perf_counter()
+    count = sum(1 for _ in batch.process_dumps(paths, jobs))
+    elapsed = time.perf_counter() - start
+    print(
+        f"jobs={jobs:<3} {count} dumps in {elapsed:.2f}s ({count / elapsed:.0f} dumps/s)"
+    )
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    screens = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with tempfile.TemporaryDirectory() as folder:
+        folder = Path(folder)
+        make_dumps(folder, count, screens)
+        paths = sorted(folder.iterdir())
+        serial = bench(paths, 1)
+        cpus = os.cpu_count() or 1
+        jobs = 2
+        while jobs <= cpus:
+            parallel = bench(paths, jobs)
+            print(f"          speedup: {serial / parallel:.2f}x")
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
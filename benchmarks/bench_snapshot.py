@@ -0,0 +1,89 @@
+"""Compare startup time with and without a saved snapshot.
+
+Usage: python benchmarks/bench_snapshot.py [--runs N] [--delay SECONDS] [--outputs N]
+
+Measures how long it takes from creating Window until the monitors
+are on screen, using a fake xrandr (see tests/fake_xrandr.py) that
+takes --delay seconds to answer, like a real one probing monitors.
+With a snapshot, the time until the background check is done is
+also reported.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide2.QtWidgets import QApplication  # noqa: E402
+
+import fake_xrandr  # noqa: E402
+from xrandroll import snapshot  # noqa: E402
+from xrandroll.main import Window, load_ui  # noqa: E402
+
+
+def start(app):
+    """Return seconds until the scene is shown, and until xrandr answered."""
+    begin = time.perf_counter()
+    window = Window(load_ui())
+    app.processEvents()
+    shown = time.perf_counter() - begin
+    process = getattr(window, "xrandr_process", None)
+    if process:
+        process.waitForFinished()
+        app.processEvents()
+    done = time.perf_counter() - begin
+    window.ui.close()
+    return shown, done
+
+
+def ms(times):
+    return f"{statistics.median(times) * 1000:8.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare startup with and without a snapshot."
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--delay", type=float, default=0.2, help="seconds the fake xrandr takes"
+    )
+    parser.add_argument(
+        "--outputs", type=int, default=64, help="monitors in the synthetic wall"
+    )
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    scenarios = [
+        ("sample_1.txt", (fake_xrandr.FIXTURES / "sample_1.txt").read_text()),
+        fake_xrandr.make_wall(args.outputs),
+    ]
+    print(f"Median of {args.runs} runs, xrandr takes {args.delay}s")
+    print(f"{'':<16}{'cold shown':>12}{'warm shown':>12}{'warm checked':>14}")
+    for title, dump in scenarios:
+        cold, warm, checked = [], [], []
+        with tempfile.TemporaryDirectory() as folder:
+            with fake_xrandr.serving(folder, dump, FAKE_XRANDR_DELAY=str(args.delay)):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for _ in range(args.runs):
+                        with contextlib.suppress(FileNotFoundError):
+                            os.unlink(snapshot.default_path())
+                        cold.append(start(app)[0])
+                        shown, done = start(app)
+                        warm.append(shown)
+                        checked.append(done)
+        print(f"{title:<16}{ms(cold):>12}{ms(warm):>12}{ms(checked):>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark cold start time of the main dialog.
+
+Usage: python benchmarks/bench_startup.py [RUNS]
+
+Each run is a fresh Python process on Qt's offscreen platform that
+imports xrandroll, creates the dialog and shows it. The compiled UI
+(see build.py) is compared against parsing main.ui with QUiLoader.
+
+Importing PySide2 and starting Qt take most of the total, so the time
+spent just creating the dialog is reported on its own too.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from PySide2.QtWidgets import QApplication
+from xrandroll.main import load_ui
+app = QApplication([])
+load_start = time.perf_counter()
+ui = load_ui(compiled=sys.argv[1] == "compiled")
+load_time = time.perf_counter() - load_start
+ui.show()
+app.processEvents()
+print(time.perf_counter() - start, load_time)
+"""
+
+
+def run(kind):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=str(ROOT))
+    output = subprocess.check_output(
+        [sys.executable, "-c", SCRIPT, kind],
+        env=env,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+    )
+    return [float(t) for t in output.split()]
+
+
+def ms(times):
+    return f"{statistics.median(times) * 1000:7.1f}ms"
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if not (ROOT / "xrandroll" / "ui_main.py").exists():
+        print("xrandroll/ui_main.py is missing, run build.py first")
+        kinds = ["loader"]
+    else:
+        kinds = ["loader", "compiled"]
+    print(f"Median of {runs} runs")
+    print(f"{'':<9}{'total':>9}{'load_ui':>9}")
+    for kind in kinds:
+        totals, loads = zip(*(run(kind) for _ in range(runs)))
+        print(f"{kind:<9}{ms(totals):>9}{ms(loads):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Measure how responsive the editor is to user interaction.
+
+Usage: python benchmarks/bench_ui.py [--outputs N] [--iterations N] [--budget MS]
+                                     [FIXTURE ...]
+
+Runs Window on Qt's offscreen platform against a fake xrandr (see
+tests/fake_xrandr.py) serving each fixture from tests/fixtures and a
+synthetic wall of --outputs monitors. Selecting monitors, dragging
+them, moving the scale slider and toggling enabled/primary are
+scripted, and the latency of each event, including repainting, is
+reported as percentiles.
+
+With --budget, exits with an error if any p90 is over that many
+milliseconds, so it can be used in CI.
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide2.QtCore import QEvent, QPointF, Qt  # noqa: E402
+from PySide2.QtGui import QMouseEvent  # noqa: E402
+from PySide2.QtWidgets import QApplication  # noqa: E402
+
+import fake_xrandr  # noqa: E402
+from xrandroll.main import Window, load_ui  # noqa: E402
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of values, p between 0 and 100."""
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+class Recorder:
+    """Collects how long each kind of event takes."""
+
+    def __init__(self, app):
+        self.app = app
+        self.times = {}
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        yield
+        self.app.processEvents()
+        self.times.setdefault(name, []).append(time.perf_counter() - start)
+
+    def report(self, title):
+        print(f"\n{title}")
+        print(
+            f"{'event':<16}{'count':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)"
+        )
+        for name, times in self.times.items():
+            p50, p90, p99, p100 = (
+                percentile(times, p) * 1000 for p in (50, 90, 99, 100)
+            )
+            print(
+                f"{name:<16}{len(times):>7}{p50:>9.2f}{p90:>9.2f}{p99:>9.2f}{p100:>9.2f}"
+            )
+
+
+def send_mouse(window, kind, scene_pos):
+    view = window.ui.sceneView
+    pos = view.mapFromScene(scene_pos)
+    buttons = Qt.NoButton if kind == QEvent.MouseButtonRelease else Qt.LeftButton
+    event = QMouseEvent(
+        kind,
+        QPointF(pos),
+        QPointF(view.viewport().mapToGlobal(pos)),
+        Qt.LeftButton,
+        buttons,
+        Qt.NoModifier,
+    )
+    QApplication.sendEvent(view.viewport(), event)
+
+
+def drag(window, recorder, name, steps):
+    item = window.screen.monitors[name].item
+    start = item.sceneBoundingRect().center()
+    # Each step moves roughly 20 pixels in the view
+    view = window.ui.sceneView
+    step = view.mapToScene(20, 0).x() - view.mapToScene(0, 0).x()
+    with recorder.measure("press"):
+        send_mouse(window, QEvent.MouseButtonPress, start)
+    for i in range(1, steps + 1):
+        with recorder.measure("drag"):
+            send_mouse(
+                window, QEvent.MouseMove, start + QPointF(step * i, step * i / 2)
+            )
+    end = start + QPointF(step * steps, step * steps / 2)
+    with recorder.measure("release"):
+        send_mouse(window, QEvent.MouseButtonRelease, end)
+
+
+def run_scenario(app, dump, iterations):
+    """Start a Window serving dump, script interactions, and return a Recorder."""
+    recorder = Recorder(app)
+    with tempfile.TemporaryDirectory() as folder:
+        with fake_xrandr.serving(folder, dump):
+            with contextlib.redirect_stdout(io.StringIO()):
+                with recorder.measure("startup"):
+                    window = Window(load_ui())
+                names = [n for n, m in window.screen.monitors.items() if m.enabled]
+                ui = window.ui
+                for i in range(iterations):
+                    name = names[i % len(names)]
+                    with recorder.measure("select"):
+                        ui.screenCombo.setCurrentText(name)
+                    drag(window, recorder, name, 10)
+                    ui.scaleModeCombo.setCurrentText("Manual")
+                    for value in (1100, 1250, 1000):
+                        with recorder.measure("scale"):
+                            ui.horizontalScale.setValue(value)
+                    for _ in range(2):
+                        with recorder.measure("primary"):
+                            ui.primary.setChecked(not ui.primary.isChecked())
+                    if not window.screen.monitors[name].primary:
+                        for _ in range(2):
+                            with recorder.measure("enabled"):
+                                ui.enabled.setChecked(not ui.enabled.isChecked())
+                    for mon in window.screen.monitors.values():
+                        with recorder.measure("update_visuals"):
+                            mon.item.update_visuals(mon)
+                    with recorder.measure("adjust_view"):
+                        window.adjust_view()
+                ui.close()
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure UI interaction latency.")
+    parser.add_argument(
+        "fixtures", nargs="*", default=["sample_1.txt", "replicated.txt"]
+    )
+    parser.add_argument(
+        "--outputs", type=int, default=64, help="monitors in the synthetic wall"
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=None, help="maximum p90 in ms")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    scenarios = [
+        (name, (fake_xrandr.FIXTURES / name).read_text()) for name in args.fixtures
+    ]
+    if args.outputs:
+        scenarios.append(fake_xrandr.make_wall(args.outputs))
+
+    over_budget = []
+    for title, dump in scenarios:
+        recorder = run_scenario(app, dump, args.iterations)
+        recorder.report(title)
+        if args.budget is not None:
+            for name, times in recorder.times.items():
+                if name != "startup" and percentile(times, 90) * 1000 > args.budget:
+                    over_budget.append(f"{title}: {name}")
+    if over_budget:
+        print(f"\nOver the {args.budget}ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Compile xrandroll/main.ui into xrandroll/ui_main.py.
+
+Poetry runs this when building the package, and it can also be run
+by hand after editing main.ui. The generated module records a hash of
+main.ui, so xrandroll only uses it while it matches main.ui, and parses
+main.ui with QUiLoader otherwise.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+UI_FILE = os.path.join(HERE, "xrandroll", "main.ui")
+UI_MODULE = os.path.join(HERE, "xrandroll", "ui_main.py")
+
+
+def find_uic():
+    """Find pyside2-uic, preferring the one next to this Python."""
+    local = os.path.join(os.path.dirname(sys.executable), "pyside2-uic")
+    if os.path.exists(local):
+        return local
+    uic = shutil.which("pyside2-uic")
+    if uic is None:
+        raise RuntimeError("pyside2-uic not found, is PySide2 installed?")
+    return uic
+
+
+def build(setup_kwargs=None):
+    with open(UI_FILE, "rb") as f:
+        ui_hash = hashlib.sha256(f.read()).hexdigest()
+    code = subprocess.check_output([find_uic(), UI_FILE], encoding="utf-8")
+    with open(UI_MODULE, "w", encoding="utf-8") as f:
+        f.write(code)
+        f.write(
+            f'\n# sha256 of the main.ui this was made from\nUI_HASH = "{ui_hash}"\n'
+        )
+
+
+if __name__ == "__main__":
+    build()
@@ -1,4 +1,16 @@
+import os
 from pathlib import Path
+
+import pytest
 from fixtures import TestData
 
 TestData.BASE_PATH = Path(__file__).parent / "fixtures"
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide2.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
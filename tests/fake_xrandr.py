@@ -0,0 +1,210 @@
+"""A fake xrandr for tests and benchmarks.
+
+When run with --verbose it prints the dump in $FAKE_XRANDR_DUMP,
+after waiting $FAKE_XRANDR_DELAY seconds, if set, like a real xrandr
+probing monitors would (but not with --current).
+
+Commands for an --output are applied to the dump, and appended as a
+line to $FAKE_XRANDR_LOG, if set. To make things fail on purpose,
+$FAKE_XRANDR_FAIL and $FAKE_XRANDR_IGNORE are comma separated lists of
+OUTPUT or OUTPUT:TIMES. Commands for those outputs are not applied
+(the first TIMES times, or always), and either fail, or pretend they
+worked.
+
+serving() sets it up for the duration of a with block, install() just
+puts it in a folder as "xrandr" so it can be prepended to $PATH, and
+make_dump() and make_wall() create synthetic dumps with many outputs.
+"""
+
+import contextlib
+import math
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def install(folder, dump, log=None):
+    """Install the fake xrandr in folder, serving dump.
+
+    Returns a dictionary with the environment variables to set.
+    """
+    folder = Path(folder)
+    script = folder / "xrandr"
+    script.write_text(
+        f'#!/bin/sh\nexec "{sys.executable}" "{Path(__file__).resolve()}" "$@"\n'
+    )
+    script.chmod(0o755)
+    env = {
+        "PATH": f"{folder}{os.pathsep}{os.environ.get('PATH', '')}",
+        "FAKE_XRANDR_DUMP": str(dump),
+    }
+    if log:
+        env["FAKE_XRANDR_LOG"] = str(log)
+    return env
+
+
+@contextlib.contextmanager
+def serving(folder, dump, **env):
+    """Serve the text dump with the fake xrandr while in the with block.
+
+    Everything goes in folder: the dump as dump.txt, the log of
+    commands as log.txt, and $XDG_CACHE_HOME as cache, so snapshots
+    don't leak out. env is more environment variables to set. The
+    environment is restored afterwards. Yields the path of the dump.
+    """
+    folder = Path(folder)
+    dump_path = folder / "dump.txt"
+    dump_path.write_text(dump)
+    old_env = dict(os.environ)
+    os.environ.update(install(folder, dump_path, folder / "log.txt"))
+    os.environ["XDG_CACHE_HOME"] = str(folder / "cache")
+    os.environ.update(env)
+    try:
+        yield dump_path
+    finally:
+        os.environ.clear()
+        os.environ.update(old_env)
+
+
+def make_wall(outputs):
+    """Return a title and a dump for a roughly square wall of outputs."""
+    columns = max(1, int(math.sqrt(outputs)))
+    rows = math.ceil(outputs / columns)
+    return f"{columns}x{rows} wall", make_dump(columns, rows)
+
+
+def make_dump(columns, rows, w=1920, h=1080):
+    """Return the text of a dump with a columns x rows wall of outputs.
+
+    Every output is a copy of the eDP monitor in sample_1.txt, named
+    DP-0, DP-1... and DP-0 is primary.
+    """
+    lines = (FIXTURES / "sample_1.txt").read_text().splitlines()
+    end = next(i for i, line in enumerate(lines) if line.startswith("HDMI-A-0"))
+    header = lines[1].split(" (0x56) ")[1]
+    body = lines[2:end]
+
+    dump = [
+        f"Screen 0: minimum 320 x 200, current {w * columns} x {h * rows}, maximum 16384 x 16384"
+    ]
+    for i in range(columns * rows):
+        row, col = divmod(i, columns)
+        primary = " primary" if i == 0 else ""
+        dump.append(
+            f"DP-{i} connected{primary} {w}x{h}+{col * w}+{row * h} (0x56) {header}"
+        )
+        dump.extend(body)
+    return "\n".join(dump) + "\n"
+
+
+def _failures(env_var, output, dump):
+    """Decide if the command for output should fail, counting failures in a file."""
+    for entry in os.environ.get(env_var, "").split(","):
+        name, _, times = entry.partition(":")
+        if name != output:
+            continue
+        count_file = Path(f"{dump}.{env_var}.{output}")
+        count = int(count_file.read_text()) if count_file.exists() else 0
+        if times and count >= int(times):
+            return False
+        count_file.write_text(str(count + 1))
+        return True
+    return False
+
+
+def apply_command(lines, options):
+    """Change the dump in lines like xrandr would for options."""
+    output = options["--output"]
+    start = next(i for i, line in enumerate(lines) if line.startswith(f"{output} "))
+    end = next(
+        (i for i in range(start + 1, len(lines)) if re.match(r"^[^ \t]", lines[i])),
+        len(lines),
+    )
+    header = lines[start]
+    mm = header.rpartition(")")[2]
+    primary = " primary" in header
+    if "--primary" in options:
+        for i, line in enumerate(lines):
+            lines[i] = (
+                line.replace(" primary ", " ", 1)
+                if re.match(r"^[^ \t]", line)
+                else line
+            )
+        primary = True
+
+    modes = []  # (index, name, res_x, res_y, frequency)
+    for i in range(start + 1, end):
+        match = re.match(r"^  (\d+)x(\d+)\S* \((0x[0-9a-f]+)\)", lines[i])
+        if match:
+            freq = float(re.search(r"([\d.]+)Hz", lines[i + 2]).group(1))
+            modes.append(
+                (i, match.group(3), int(match.group(1)), int(match.group(2)), freq)
+            )
+        lines[i] = lines[i].replace(" *current", "")
+
+    orientations = "(normal left inverted right x axis y axis)"
+    if "--off" in options:
+        lines[start] = f"{output} connected {orientations}{mm}"
+        return
+    old_pos = re.search(r"\+(\d+)\+(\d+)", header)
+    pos = options.get(
+        "--pos", f"{old_pos.group(1)}x{old_pos.group(2)}" if old_pos else "0x0"
+    )
+    res_x, res_y = (int(v) for v in options["--mode"].split("x"))
+    rate = float(options.get("--rate", 0))
+    candidates = [m for m in modes if (m[2], m[3]) == (res_x, res_y)]
+    index, mode_name, _, _, _ = min(candidates, key=lambda m: abs(m[4] - rate))
+    lines[index] = lines[index].replace(" +preferred", " *current +preferred")
+    if "*current" not in lines[index]:
+        lines[index] += " *current"
+
+    rotate = options.get("--rotate", "normal")
+    scale_x, scale_y = (float(v) for v in options.get("--scale", "1x1").split("x"))
+    if rotate in ("left", "right"):
+        res_x, res_y = res_y, res_x
+    size = f"{round(res_x * scale_x)}x{round(res_y * scale_y)}"
+    pos_x, pos_y = pos.split("x")
+    primary = " primary" if primary else ""
+    lines[
+        start
+    ] = f"{output} connected{primary} {size}+{pos_x}+{pos_y} ({mode_name}) {rotate} {orientations}{mm}"
+
+
+def main(argv):
+    dump = Path(os.environ["FAKE_XRANDR_DUMP"])
+    if "--verbose" in argv:
+        if "--current" not in argv:
+            time.sleep(float(os.environ.get("FAKE_XRANDR_DELAY", 0)))
+        sys.stdout.write(dump.read_text())
+        return 0
+    log = os.environ.get("FAKE_XRANDR_LOG")
+    if log:
+        with open(log, "a") as f:
+            f.write(" ".join(argv) + "\n")
+
+    options = {}
+    for i, arg in enumerate(argv):
+        if arg in ("--off", "--primary"):
+            options[arg] = True
+        elif arg.startswith("--"):
+            options[arg] = argv[i + 1]
+    output = options.get("--output")
+    if not output:
+        return 0
+    if _failures("FAKE_XRANDR_FAIL", output, dump):
+        print(f"xrandr: Configure crtc for {output} failed", file=sys.stderr)
+        return 1
+    if _failures("FAKE_XRANDR_IGNORE", output, dump):
+        return 0
+    lines = dump.read_text().splitlines()
+    apply_command(lines, options)
+    dump.write_text("\n".join(lines) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+import pytest
+
+import fake_xrandr
+from xrandroll import apply, xrandr
+from xrandroll.xrandr import parse_data
+
+
+@pytest.fixture
+def server(test_data, tmp_path):
+    """A fake xrandr serving sample_1.txt, returns the path of its dump."""
+    dump = test_data.read("sample_1.txt", deserialize=False)
+    with fake_xrandr.serving(tmp_path, dump) as dump_path:
+        yield dump_path
+
+
+def read_server(dump):
+    return parse_data(dump.read_text().splitlines())
+
+
+def log(server):
+    path = server.parent / "log.txt"
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def test_nothing_to_apply(server):
+    report = apply.apply_screen(read_server(server), read_server(server))
+    assert report.outputs == {}
+    assert report.ok
+    assert log(server) == []
+
+
+def test_only_touched_outputs(server):
+    previous = read_server(server)
+    screen = read_server(server)
+    screen.monitors["HDMI-A-0"].pos_x = 1920
+    read_back = []
+
+    def read(outputs, number):
+        read_back.append(list(outputs))
+        return xrandr.read_outputs(outputs, number)
+
+    report = apply.apply_screen(screen, previous, read=read)
+    assert report.ok
+    assert list(report.outputs) == ["HDMI-A-0"]
+    assert report.outputs["HDMI-A-0"].status == apply.OK
+    assert read_back == [["HDMI-A-0"]]
+    assert log(server) == [
+        "--output HDMI-A-0 --pos 1920x0 --mode 1920x1080 --rate 60.0 --scale 1.0x1.0 --rotate normal"
+    ]
+    assert read_server(server).monitors["HDMI-A-0"].pos_x == 1920
+
+
+def test_change_mode_and_rotation(server):
+    screen = read_server(server)
+    mon = screen.monitors["eDP"]
+    mon.set_current_mode("0x57")
+    mon.orientation = "left"
+    mon.res_x, mon.res_y = 1050, 1680
+    report = apply.apply_screen(screen, read_server(server))
+    assert report.ok, report
+    actual = read_server(server).monitors["eDP"]
+    assert actual.get_current_mode_name() == "0x57"
+    assert (actual.res_x, actual.res_y, actual.orientation) == (1050, 1680, "left")
+
+
+def test_retry(server, monkeypatch):
+    monkeypatch.setenv("FAKE_XRANDR_IGNORE", "HDMI-A-0:1")
+    screen = read_server(server)
+    screen.monitors["HDMI-A-0"].pos_x = 1920
+    screen.monitors["eDP"].pos_y = 0
+    report = apply.apply_screen(screen, read_server(server))
+    assert report.ok
+    assert report.outputs["eDP"].status == apply.OK
+    assert report.outputs["eDP"].attempts == 1
+    assert report.outputs["HDMI-A-0"].status == apply.RETRIED
+    assert report.outputs["HDMI-A-0"].attempts == 2
+    assert read_server(server).monitors["HDMI-A-0"].pos_x == 1920
+
+
+@pytest.mark.parametrize("env_var", ["FAKE_XRANDR_IGNORE", "FAKE_XRANDR_FAIL"])
+def test_roll_back(server, monkeypatch, env_var):
+    monkeypatch.setenv(env_var, "HDMI-A-0:2")
+    previous = read_server(server)
+    screen = read_server(server)
+    screen.monitors["HDMI-A-0"].pos_x = 1920
+    screen.set_primary("HDMI-A-0")
+    report = apply.apply_screen(screen, previous)
+    assert not report.ok
+    assert report.outputs["eDP"].status == apply.OK
+    result = report.outputs["HDMI-A-0"]
+    assert result.status == apply.ROLLED_BACK
+    assert result.attempts == 3
+    assert "position is 1x0, expected 1920x0" in result.problems
+    assert bool(result.errors) == (env_var == "FAKE_XRANDR_FAIL")
+    assert read_server(server).monitors["HDMI-A-0"].pos_x == 1
+    assert "HDMI-A-0: rolled back after 3 attempt(s)" in repr(report)
+
+
+def test_failed_without_previous(server, monkeypatch):
+    monkeypatch.setenv("FAKE_XRANDR_IGNORE", "HDMI-A-0")
+    screen = read_server(server)
+    screen.monitors["HDMI-A-0"].pos_x = 1920
+    report = apply.apply_screen(screen, retries=2)
+    assert report.outputs["eDP"].status == apply.OK
+    assert report.outputs["HDMI-A-0"].status == apply.FAILED
+    assert report.outputs["HDMI-A-0"].attempts == 3
+    assert report.outputs["HDMI-A-0"].actual.pos_x == 1
+
+
+def test_disable(server):
+    screen = read_server(server)
+    screen.monitors["HDMI-A-0"].enabled = False
+    report = apply.apply_screen(screen, read_server(server))
+    assert report.ok
+    assert not read_server(server).monitors["HDMI-A-0"].enabled
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from xrandroll import batch
+
+
+def write_dumps(test_data, folder):
+    for name in ("sample_1.txt", "replicated.txt", "two_screens.txt"):
+        (folder / name).write_text(test_data.read(name, deserialize=False))
+    (folder / "broken.txt").write_text(
+        "Screen 0: minimum 320 x 200\neDP connected 1920x\n"
+    )
+
+
+def test_process_dump(test_data, tmp_path):
+    write_dumps(test_data, tmp_path)
+    result = batch.process_dump(tmp_path / "two_screens.txt")
+    assert [s["number"] for s in result["screens"]] == [0, 1]
+    edp = result["screens"][0]["monitors"][0]
+    assert edp["output"] == "eDP"
+    assert edp["pos"] == [0, 1080]
+    assert result["screens"][1]["monitors"][0]["replica_of"] == ["DP-2"]
+    assert result["screens"][1]["overlaps"] == []
+    assert len(result["screens"][0]["commands"]) == 2
+
+
+def test_broken_dump(tmp_path):
+    (tmp_path / "broken.txt").write_text(
+        "Screen 0: minimum 320 x 200\neDP connected 1920x\n"
+    )
+    result = batch.process_dump(tmp_path / "broken.txt")
+    assert "screens" not in result
+    assert result["error"]
+
+
+def test_not_a_dump(tmp_path):
+    (tmp_path / "empty.txt").write_text("")
+    (tmp_path / "notes.txt").write_text("eDP is flickering\n")
+    for name in ("empty.txt", "notes.txt"):
+        result = batch.process_dump(tmp_path / name)
+        assert "screens" not in result
+        assert "Screen" in result["error"]
+
+
+def test_process_dumps_parallel(test_data, tmp_path):
+    write_dumps(test_data, tmp_path)
+    paths = sorted(tmp_path.iterdir())
+    assert list(batch.process_dumps(paths, jobs=2)) == list(
+        batch.process_dumps(paths, jobs=1)
+    )
+
+
+def test_main(test_data, tmp_path, capsys):
+    write_dumps(test_data, tmp_path)
+    assert batch.main([str(tmp_path), "-j", "2"]) == 1
+    out, err = capsys.readouterr()
+    results = [json.loads(line) for line in out.splitlines()]
+    assert [r["file"].rsplit("/", 1)[-1] for r in results] == [
+        "broken.txt",
+        "replicated.txt",
+        "sample_1.txt",
+        "two_screens.txt",
+    ]
+    assert "1 of 4 dumps failed" in err
+    assert batch.main([str(tmp_path), "--pattern", "s*.txt"]) == 0
+
+
+def test_bad_jobs(tmp_path, capsys):
+    for jobs in ("0", "-2"):
+        with pytest.raises(SystemExit):
+            batch.main([str(tmp_path), "-j", jobs])
+        assert "must be at least 1" in capsys.readouterr().err
+
+
+def test_no_dumps(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        batch.main([str(tmp_path / "missing")])
+    assert "is not a directory" in capsys.readouterr().err
+    assert batch.main([str(tmp_path)]) == 1
+    assert "No files match" in capsys.readouterr().err
@@ -0,0 +1,117 @@
+from xrandroll import layout
+from xrandroll.xrandr import Screen, parse_data
+
+SCREEN_HEADER = (
+    "Screen 0: minimum 320 x 200, current 1920 x 1080, maximum 16384 x 16384"
+)
+MONITOR_HEADER = (
+    "{name} connected {w}x{h}+{x}+{y} (0x{mode:x}) normal "
+    "(normal left inverted right x axis y axis) 600mm x 340mm"
+)
+
+
+def make_screen(*rects):
+    """Build a Screen out of (x, y, w, h) tuples, named DP-0, DP-1..."""
+    data = [SCREEN_HEADER]
+    for i, (x, y, w, h) in enumerate(rects):
+        data.append(
+            MONITOR_HEADER.format(name=f"DP-{i}", w=w, h=h, x=x, y=y, mode=i + 0x40)
+        )
+    return Screen(data)
+
+
+def make_wall(columns, rows, w=1920, h=1080):
+    return make_screen(
+        *[(c * w, r * h, w, h) for r in range(rows) for c in range(columns)]
+    )
+
+
+def test_normalize():
+    screen = make_screen((0, 0, 1920, 1080), (1920, 0, 1920, 1080))
+    screen.monitors["DP-0"].pos_x = -300
+    screen.monitors["DP-1"].pos_y = -20
+    assert layout.normalize(screen) == (300, 20)
+    assert (screen.monitors["DP-0"].pos_x, screen.monitors["DP-0"].pos_y) == (0, 20)
+    assert (screen.monitors["DP-1"].pos_x, screen.monitors["DP-1"].pos_y) == (2220, 0)
+    assert layout.normalize(screen) == (0, 0)
+
+
+def test_overlaps():
+    screen = make_screen(
+        (0, 0, 1920, 1080), (1900, 0, 1920, 1080), (3820, 0, 1920, 1080)
+    )
+    assert layout.find_overlaps(screen) == [("DP-0", "DP-1")]
+
+
+def test_touching_is_not_overlap():
+    screen = make_wall(3, 2)
+    assert layout.find_overlaps(screen) == []
+    assert layout.find_gaps(screen) == []
+
+
+def test_replicas_are_not_overlaps(test_data):
+    data = test_data.read("replicated.txt", deserialize=False).splitlines()
+    screen = parse_data(data)
+    assert layout.find_overlaps(screen) == []
+
+
+def test_gaps():
+    screen = make_screen((0, 0, 1920, 1080), (2020, 0, 1280, 1024))
+    assert layout.find_gaps(screen) == [
+        (1920, 0, 100, 1080),
+        (2020, 1024, 1280, 56),
+    ]
+
+
+def test_disabled_monitors_are_ignored(test_data):
+    data = test_data.read("fisa_sample.txt", deserialize=False).splitlines()
+    screen = parse_data(data)
+    assert layout.find_overlaps(screen) == [("DP-1-1", "eDP-1-1")]
+    assert layout.find_gaps(screen) == []
+
+
+def test_auto_arrange_row():
+    screen = make_screen(
+        (500, 500, 1920, 1080), (0, 0, 1280, 1024), (-10, 40, 1920, 1200)
+    )
+    layout.auto_arrange(screen)
+    assert [(m.pos_x, m.pos_y) for m in screen.monitors.values()] == [
+        (0, 0),
+        (1920, 0),
+        (3200, 0),
+    ]
+    assert layout.find_overlaps(screen) == []
+
+
+def test_auto_arrange_grid():
+    screen = make_screen(*[(i * 10, 0, 1920, 1080) for i in range(5)])
+    layout.auto_arrange(screen, columns=2)
+    assert [(m.pos_x, m.pos_y) for m in screen.monitors.values()] == [
+        (0, 0),
+        (1920, 0),
+        (0, 1080),
+        (1920, 1080),
+        (0, 2160),
+    ]
+    assert layout.find_overlaps(screen) == []
+    assert layout.find_gaps(screen) == [(1920, 2160, 1920, 1080)]
+
+
+def test_auto_arrange_keeps_replicas(test_data):
+    data = test_data.read("replicated.txt", deserialize=False).splitlines()
+    screen = parse_data(data)
+    layout.auto_arrange(screen)
+    assert screen.monitors["eDP"].replica_of == ["HDMI-A-0"]
+
+
+def test_large_wall():
+    screen = make_wall(16, 8)
+    assert len(screen.monitors) == 128
+    assert layout.find_overlaps(screen) == []
+    assert layout.find_gaps(screen) == []
+    screen.monitors["DP-0"].pos_x = 100
+    assert layout.find_overlaps(screen) == [("DP-0", "DP-1")]
+    assert layout.find_gaps(screen) == [(0, 0, 100, 1080)]
+    layout.auto_arrange(screen, columns=16)
+    assert layout.find_overlaps(screen) == []
+    assert layout.find_gaps(screen) == []
@@ -0,0 +1,37 @@
+import pytest
+
+from xrandroll.main import load_ui
+
+WIDGETS = [
+    "sceneView",
+    "screenCombo",
+    "modes",
+    "horizontalScale",
+    "primary",
+    "enabled",
+    "applyButton",
+]
+
+
+def check_widgets(ui):
+    for name in WIDGETS:
+        assert getattr(ui, name).objectName() == name
+
+
+def test_load_ui_compiled(qapp):
+    ui_main = pytest.importorskip("xrandroll.ui_main")
+    ui = load_ui(compiled=True)
+    assert isinstance(ui, ui_main.Ui_Main)
+    check_widgets(ui)
+
+
+def test_load_ui_loader(qapp):
+    ui = load_ui(compiled=False)
+    assert type(ui).__name__ == "QDialog"
+    check_widgets(ui)
+
+
+def test_stale_compiled_ui_is_not_used(qapp, monkeypatch):
+    ui_main = pytest.importorskip("xrandroll.ui_main")
+    monkeypatch.setattr(ui_main, "UI_HASH", "not the hash of main.ui")
+    assert not isinstance(load_ui(compiled=True), ui_main.Ui_Main)
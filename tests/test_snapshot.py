@@ -0,0 +1,98 @@
+from xrandroll import snapshot
+from xrandroll.xrandr import parse_data
+
+
+def sample(test_data, name="sample_1.txt"):
+    data = test_data.read(name, deserialize=False).splitlines()
+    return data, parse_data(data)
+
+
+def test_roundtrip(test_data, tmp_path):
+    data, screen = sample(test_data)
+    screen.monitors["eDP"].item = object()  # Not saved
+    path = tmp_path / "cache" / "screen.snapshot"
+    snapshot.save(path, screen, snapshot.digest(data))
+    saved = snapshot.load(path)
+    assert saved.digest == snapshot.digest(data)
+    loaded = saved.screen()
+    assert list(loaded.monitors) == ["eDP", "HDMI-A-0"]
+    assert loaded.monitors["eDP"].item is None
+    assert loaded.generate() == parse_data(data).generate()
+    assert snapshot.changed_monitors(loaded, parse_data(data)) == []
+    # Much smaller than the data, and each Screen is a new one
+    assert path.stat().st_size < len("\n".join(data)) / 10
+    assert saved.screen() is not loaded
+    assert saved.screen().monitors["eDP"] is not loaded.monitors["eDP"]
+
+
+def test_roundtrip_edited(test_data, tmp_path):
+    data, screen = sample(test_data, "replicated.txt")
+    screen.monitors["HDMI-A-0"].orientation = "left"
+    screen.monitors["HDMI-A-0"].set_current_mode("0x5f")
+    screen.set_primary("HDMI-A-0")
+    path = tmp_path / "screen.snapshot"
+    snapshot.save(path, screen, snapshot.digest(data))
+    loaded = snapshot.load(path).screen()
+    assert snapshot.changed_monitors(screen, loaded) == []
+    assert loaded.generate() == screen.generate()
+
+
+def test_roundtrip_output_off(test_data, tmp_path):
+    data = test_data.read("sample_1.txt", deserialize=False).splitlines()
+    data = [
+        line.replace("connected 1920x1080+1+0 (0x5f) normal", "connected")
+        for line in data
+    ]
+    screen = parse_data(data)
+    assert not screen.monitors["HDMI-A-0"].enabled
+    path = tmp_path / "screen.snapshot"
+    snapshot.save(path, screen, snapshot.digest(data))
+    loaded = snapshot.load(path).screen()
+    assert loaded.monitors["HDMI-A-0"].orientation == "normal"
+    assert snapshot.changed_monitors(screen, loaded) == []
+    assert loaded.generate() == screen.generate()
+
+
+def test_roundtrip_not_verbose(test_data, tmp_path):
+    # Not --verbose, so there are no modes and no orientations
+    data, screen = sample(test_data, "fisa_sample.txt")
+    path = tmp_path / "screen.snapshot"
+    snapshot.save(path, screen, snapshot.digest(data))
+    loaded = snapshot.load(path).screen()
+    assert list(loaded.monitors) == list(screen.monitors)
+    assert snapshot.changed_monitors(screen, loaded) == []
+
+
+def test_missing_or_bad(test_data, tmp_path):
+    data, screen = sample(test_data)
+    path = tmp_path / "screen.snapshot"
+    assert snapshot.load(path) is None
+    path.write_bytes(b"")
+    assert snapshot.load(path) is None
+    snapshot.save(path, screen, snapshot.digest(data))
+    good = path.read_bytes()
+    path.write_bytes(good[:-10])
+    assert snapshot.load(path) is None
+    path.write_bytes(good.replace(b"XRRS", b"XXXX", 1))
+    assert snapshot.load(path) is None
+    schema = (snapshot.SCHEMA + 1).to_bytes(4, "little")
+    path.write_bytes(good[:4] + schema + good[8:])
+    assert snapshot.load(path) is None
+    # Lengths that don't add up
+    bad = bytearray(good)
+    bad[snapshot.HEADER.size + 4] = 0xFF  # Too many monitors
+    path.write_bytes(bad)
+    assert snapshot.load(path) is None
+    path.write_bytes(good + b"\0")
+    assert snapshot.load(path) is None
+
+
+def test_stale(test_data):
+    data, screen = sample(test_data)
+    live = [line.replace("1920x1080+1+0", "1920x1080+1920+0") for line in data]
+    assert snapshot.digest(live) != snapshot.digest(data)
+    assert snapshot.changed_monitors(screen, parse_data(live)) == ["HDMI-A-0"]
+    _, replicated = sample(test_data, "replicated.txt")
+    assert snapshot.changed_monitors(screen, replicated) == ["eDP", "HDMI-A-0"]
+    _, fisa = sample(test_data, "fisa_sample.txt")
+    assert snapshot.changed_monitors(screen, fisa) is None
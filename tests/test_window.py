@@ -0,0 +1,173 @@
+import pytest
+
+import fake_xrandr
+from xrandroll import snapshot
+from xrandroll.main import Window, load_ui
+
+
+@pytest.fixture
+def window(qapp, test_data, tmp_path):
+    with fake_xrandr.serving(
+        tmp_path, test_data.read("sample_1.txt", deserialize=False)
+    ):
+        window = Window(load_ui())
+        qapp.processEvents()
+        yield window
+        window.ui.close()
+
+
+def test_startup(window):
+    assert [window.ui.screenCombo.itemText(i) for i in range(2)] == ["eDP", "HDMI-A-0"]
+    assert window.ui.screenCombo.currentText() == "eDP"
+    assert window.ui.primary.isChecked()
+
+
+def test_select_does_not_move(window):
+    window.ui.screenCombo.setCurrentText("HDMI-A-0")
+    window.ui.screenCombo.setCurrentText("eDP")
+    positions = [(m.pos_x, m.pos_y) for m in window.screen.monitors.values()]
+    assert positions == [(0, 1080), (1, 0)]
+
+
+def test_arrange(window):
+    window.screen.monitors["HDMI-A-0"].pos_x = 500
+    window.ui.arrangeButton.click()
+    positions = [(m.pos_x, m.pos_y) for m in window.screen.monitors.values()]
+    assert positions == [(0, 0), (1920, 0)]
+    assert window.screen.monitors["HDMI-A-0"].item.x() == 1920
+
+
+def test_apply(window, tmp_path):
+    window.ui.screenCombo.setCurrentText("HDMI-A-0")
+    window.ui.primary.setChecked(True)
+    window.do_apply()
+    log = (tmp_path / "log.txt").read_text().splitlines()
+    assert log == [
+        "--output eDP --pos 0x1080 --mode 1920x1080 --rate 60.01 --scale 1.0x1.0 --rotate normal",
+        "--output HDMI-A-0 --pos 1x0 --mode 1920x1080 --rate 60.0 --scale 1.0x1.0 --rotate normal --primary",
+    ]
+
+
+def wait_for_xrandr(qapp, window):
+    window.xrandr_process.waitForFinished()
+    qapp.processEvents()
+
+
+def test_startup_from_snapshot(qapp, window, tmp_path):
+    assert window.xrandr_process is None
+    window.ui.close()
+    window = Window(load_ui())
+    assert window.screen.monitors["eDP"].pos_y == 1080
+    wait_for_xrandr(qapp, window)
+    assert window.screen.monitors["eDP"].pos_y == 1080
+    assert window.ui.screenCombo.currentText() == "eDP"
+    window.ui.close()
+
+
+def test_stale_snapshot(qapp, window, tmp_path):
+    window.ui.close()
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump.read_text().replace("1920x1080+1+0", "1920x1080+1920+0"))
+    window = Window(load_ui())
+    # Starts with what was saved
+    assert window.screen.monitors["HDMI-A-0"].pos_x == 1
+    assert window.screen.monitors["HDMI-A-0"].item.x() == 1
+    wait_for_xrandr(qapp, window)
+    # And gets what's live
+    assert window.screen.monitors["HDMI-A-0"].pos_x == 1920
+    assert window.screen.monitors["HDMI-A-0"].item.x() == 1920
+    assert window.reset_screen.monitors["HDMI-A-0"].pos_x == 1920
+    window.ui.close()
+    # Which is saved for next time
+    window = Window(load_ui())
+    assert window.screen.monitors["HDMI-A-0"].pos_x == 1920
+    wait_for_xrandr(qapp, window)
+    window.ui.close()
+
+
+def test_stale_snapshot_keeps_edits(qapp, window, tmp_path):
+    window.ui.close()
+    dump = tmp_path / "dump.txt"
+    live = dump.read_text().replace("1920x1080+1+0", "1920x1080+1920+0")
+    dump.write_text(live.replace("1920x1080+0+1080", "1920x1080+0+1000"))
+    window = Window(load_ui())
+    qapp.processEvents()
+    window.ui.screenCombo.setCurrentText("HDMI-A-0")
+    window.screen.monitors["HDMI-A-0"].pos_x = 500
+    wait_for_xrandr(qapp, window)
+    # The edit is kept, the untouched monitor is updated
+    assert window.screen.monitors["HDMI-A-0"].pos_x == 500
+    assert window.screen.monitors["eDP"].pos_y == 1000
+    assert window.screen.monitors["eDP"].item.y() == 1000
+    # Reset and apply compare against what's live
+    assert window.reset_screen.monitors["HDMI-A-0"].pos_x == 1920
+    assert window.server_screen.monitors["eDP"].pos_y == 1000
+    window.ui.close()
+
+
+def test_output_turned_off(qapp, window, tmp_path):
+    window.ui.close()
+    dump = tmp_path / "dump.txt"
+    off = "HDMI-A-0 connected (normal"
+    dump.write_text(
+        dump.read_text().replace(
+            "HDMI-A-0 connected 1920x1080+1+0 (0x5f) normal (normal", off
+        )
+    )
+    # The stale snapshot is updated with the output turned off
+    window = Window(load_ui())
+    wait_for_xrandr(qapp, window)
+    assert not window.screen.monitors["HDMI-A-0"].enabled
+    assert window.do_apply().ok
+    window.ui.close()
+    # And that is what the next start gets
+    window = Window(load_ui())
+    assert not window.screen.monitors["HDMI-A-0"].enabled
+    wait_for_xrandr(qapp, window)
+    window.ui.close()
+
+
+def test_apply_before_xrandr_answers(qapp, window, tmp_path, monkeypatch):
+    window.ui.close()
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump.read_text().replace("1920x1080+1+0", "1920x1080+1920+0"))
+    monkeypatch.setenv("FAKE_XRANDR_DELAY", "0.2")
+    window = Window(load_ui())
+    qapp.processEvents()
+    # What was saved is not what's live, so applying it changes things
+    saved = snapshot.load(window.snapshot_path).screen()
+    report = window.apply_screen(saved)
+    assert list(report.outputs) == ["HDMI-A-0"]
+    assert report.ok
+    assert window.server_screen.monitors["HDMI-A-0"].pos_x == 1
+    window.ui.close()
+
+
+def test_reset_before_xrandr_answers(qapp, window, tmp_path, monkeypatch):
+    window.ui.close()
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump.read_text().replace("1920x1080+1+0", "1920x1080+1920+0"))
+    monkeypatch.setenv("FAKE_XRANDR_DELAY", "0.2")
+    window = Window(load_ui())
+    qapp.processEvents()
+    window.do_reset()
+    # Nothing changed since the window opened, so nothing is applied
+    assert not (tmp_path / "log.txt").exists()
+    assert window.server_screen.monitors["HDMI-A-0"].pos_x == 1920
+    window.ui.close()
+
+
+def test_apply_rolls_back(window, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_XRANDR_IGNORE", "HDMI-A-0")
+    window.screen.monitors["HDMI-A-0"].pos_x = 1920
+    window.screen.monitors["eDP"].pos_y = 0
+    report = window.do_apply()
+    assert report.outputs["eDP"].status == "ok"
+    assert report.outputs["HDMI-A-0"].status == "rolled back"
+    assert window.server_screen.monitors["eDP"].pos_y == 0
+    assert window.server_screen.monitors["HDMI-A-0"].pos_x == 1
+    # Only what is still different from the server is tried again
+    monkeypatch.delenv("FAKE_XRANDR_IGNORE")
+    report = window.do_apply()
+    assert list(report.outputs) == ["HDMI-A-0"]
+    assert report.ok
@@ -1,4 +1,4 @@
-from xrandroll.xrandr import parse_data
+from xrandroll.xrandr import parse_data, parse_screens
 
 
 def test_parse_data(test_data):
@@ -29,3 +29,22 @@ def test_get_set_primary(test_data):
     assert screen.get_primary().output == "HDMI-A-0"
     screen.set_primary("FOOBAR")
     assert screen.get_primary() is None
+
+
+def test_parse_screens(test_data):
+    data = test_data.read("two_screens.txt", deserialize=False).splitlines()
+    screens = parse_screens(data)
+    assert [s.number for s in screens] == [0, 1]
+    assert list(screens[0].monitors) == ["eDP", "HDMI-A-0"]
+    assert list(screens[1].monitors) == ["DP-1", "DP-2"]
+    assert screens[1].monitors["DP-1"].replica_of == ["DP-2"]
+    assert parse_data(data).number == 0
+
+
+def test_generate_other_screen(test_data):
+    data = test_data.read("two_screens.txt", deserialize=False).splitlines()
+    screens = parse_screens(data)
+    assert all("--screen" not in cmd for cmd in screens[0].generate())
+    assert all(
+        cmd.startswith("xrandr --screen 1 --output") for cmd in screens[1].generate()
+    )
@@ -0,0 +1,173 @@
+"""Apply a Screen's configuration, and make sure it actually happened."""
+
+import shlex
+import subprocess
+
+from . import xrandr
+
+# What happened to each output
+OK = "ok"  # Matched at the first try
+RETRIED = "retried"  # Matched after retrying
+ROLLED_BACK = "rolled back"  # Never matched, back to what it was before
+FAILED = "failed"  # Never matched, and couldn't roll it back either
+
+
+def run(cmd):
+    """Run a xrandr command. Return None or an error message."""
+    print(f"Running {cmd}")
+    try:
+        subprocess.check_call(shlex.split(cmd))
+    except (OSError, subprocess.CalledProcessError) as e:
+        return str(e)
+    return None
+
+
+def compare(intended, actual):
+    """Return a list of the ways Monitor actual is not like Monitor intended."""
+    if actual is None:
+        return ["output is gone"]
+    if intended.enabled != actual.enabled:
+        return [f"enabled is {actual.enabled}, expected {intended.enabled}"]
+    if not intended.enabled:
+        return []
+
+    problems = []
+    expected = (int(intended.pos_x), int(intended.pos_y))
+    if (actual.pos_x, actual.pos_y) != expected:
+        problems.append(
+            f"position is {actual.pos_x}x{actual.pos_y}, expected {expected[0]}x{expected[1]}"
+        )
+    # The server rounds scaled sizes, so allow for a pixel of difference
+    if abs(actual.res_x - intended.res_x) > 1 or abs(actual.res_y - intended.res_y) > 1:
+        problems.append(
+            f"size is {actual.res_x}x{actual.res_y}, expected {int(intended.res_x)}x{int(intended.res_y)}"
+        )
+    if actual.orientation != intended.orientation:
+        problems.append(
+            f"orientation is {actual.orientation}, expected {intended.orientation}"
+        )
+    # Only the new primary output can make the old one stop being
+    # primary, so that's the one to blame if it didn't happen
+    if intended.primary and not actual.primary:
+        problems.append("is not primary")
+    mode, actual_mode = intended.get_current_mode(), actual.get_current_mode()
+    if actual_mode is None or (
+        (actual_mode.res_x, actual_mode.res_y) != (mode.res_x, mode.res_y)
+        or abs(actual_mode.frequency - mode.frequency) > 0.05
+    ):
+        problems.append(f"mode is {actual_mode}, expected {mode}")
+    return problems
+
+
+class OutputReport:
+    """What happened when applying the configuration of one output."""
+
+    def __init__(self, output, command):
+        self.output = output
+        self.command = command
+        self.status = OK
+        self.attempts = 0
+        # Errors from xrandr, and differences from what was intended
+        self.errors = []
+        self.problems = []
+        # The Monitor as it was last read back from the server
+        self.actual = None
+
+    def __repr__(self):
+        details = "; ".join(self.errors + self.problems)
+        return f"{self.output}: {self.status} after {self.attempts} attempt(s)" + (
+            f" ({details})" if details else ""
+        )
+
+
+class ApplyReport:
+    """What happened when applying a Screen's configuration."""
+
+    def __init__(self):
+        self.outputs = {}
+
+    @property
+    def ok(self):
+        """True if every output got the intended configuration."""
+        return all(r.status in (OK, RETRIED) for r in self.outputs.values())
+
+    def __repr__(self):
+        if not self.outputs:
+            return "Nothing to apply"
+        return "\n".join(repr(r) for r in self.outputs.values())
+
+
+def apply_screen(screen, previous=None, retries=1, run=run, read=xrandr.read_outputs):
+    """Make the server's state match screen, and verify it did.
+
+    previous is a Screen with what the server had before. Only the
+    outputs that differ from it are touched, and those that still
+    don't match after retrying are rolled back to it. If previous is
+    None, all outputs are touched and there is no rolling back.
+
+    Only the touched outputs are read back from the server to verify
+    them. run and read are how commands are run and outputs read,
+    see run() and xrandr.read_outputs().
+
+    Returns an ApplyReport.
+    """
+    report = ApplyReport()
+    for output in screen.monitors:
+        command = screen.generate_output(output)
+        if (
+            previous
+            and output in previous.monitors
+            and previous.generate_output(output) == command
+        ):
+            continue
+        report.outputs[output] = OutputReport(output, command)
+
+    def attempt(outputs, target):
+        """Run the commands for outputs and verify them against Screen target.
+
+        Returns the outputs that don't match."""
+        for output in outputs:
+            result = report.outputs[output]
+            result.attempts += 1
+            error = run(target.generate_output(output))
+            if error:
+                result.errors.append(error)
+        try:
+            actual = read(outputs, screen.number)
+        except (OSError, subprocess.CalledProcessError) as e:
+            for output in outputs:
+                report.outputs[output].errors.append(str(e))
+            return list(outputs)
+        wrong = []
+        for output in outputs:
+            result = report.outputs[output]
+            result.actual = actual.get(output)
+            result.problems = compare(target.monitors[output], result.actual)
+            if result.problems:
+                wrong.append(output)
+        return wrong
+
+    wrong = attempt(list(report.outputs), screen)
+    for _ in range(retries):
+        if not wrong:
+            break
+        wrong = attempt(wrong, screen)
+        for output in report.outputs:
+            if output not in wrong and report.outputs[output].attempts > 1:
+                report.outputs[output].status = RETRIED
+
+    if wrong:
+        can_roll_back = [o for o in wrong if previous and o in previous.monitors]
+        for output in wrong:
+            report.outputs[output].status = FAILED
+        if can_roll_back:
+            reasons = {o: report.outputs[o].problems for o in can_roll_back}
+            still_wrong = attempt(can_roll_back, previous)
+            for output in can_roll_back:
+                result = report.outputs[output]
+                if output not in still_wrong:
+                    result.status = ROLLED_BACK
+                # What matters is why it didn't work, not how it compares
+                # to the previous configuration
+                result.problems = reasons[output]
+    return report
@@ -0,0 +1,127 @@
+"""Validate saved xrandr --verbose dumps and generate commands offline.
+
+Usage: python -m xrandroll.batch [-j JOBS] [--pattern GLOB] DIRECTORY
+
+Each file in DIRECTORY is parsed in a pool of worker processes and a
+JSON summary for it is written to stdout, one line per file, as soon
+as it's available.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import layout, xrandr
+
+
+def summarize_screen(screen):
+    """Return a JSON-friendly summary of a Screen."""
+    monitors = []
+    for name, mon in screen.monitors.items():
+        summary = {
+            "output": name,
+            "enabled": mon.enabled,
+            "primary": mon.primary,
+        }
+        if mon.enabled:
+            summary.update(
+                {
+                    "mode": str(mon.get_current_mode()),
+                    "pos": [mon.pos_x, mon.pos_y],
+                    "res": [mon.res_x, mon.res_y],
+                    "orientation": mon.orientation,
+                    "replica_of": mon.replica_of,
+                }
+            )
+        monitors.append(summary)
+    return {
+        "number": screen.number,
+        "monitors": monitors,
+        "overlaps": layout.find_overlaps(screen),
+        "gaps": layout.find_gaps(screen),
+        "commands": screen.generate(),
+    }
+
+
+def process_dump(path):
+    """Parse one dump and summarize it.
+
+    Never raises, errors are reported in the "error" key so one bad
+    dump doesn't stop the whole batch.
+    """
+    result = {"file": str(path)}
+    try:
+        data = Path(path).read_text(encoding="utf-8").splitlines()
+        if not data or not data[0].startswith("Screen "):
+            raise ValueError("does not start with a Screen, is it xrandr output?")
+        result["screens"] = [summarize_screen(s) for s in xrandr.parse_screens(data)]
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def process_dumps(paths, jobs=None):
+    """Yield a summary for each path, in order.
+
+    jobs is the number of worker processes, defaults to one per CPU.
+    If it's 1 everything runs in this process.
+    """
+    paths = list(paths)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        yield from map(process_dump, paths)
+        return
+    # Big chunks keep inter-process overhead low, small ones keep
+    # results flowing and the workers evenly loaded.
+    chunksize = max(1, min(64, len(paths) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(process_dump, paths, chunksize=chunksize)
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Validate xrandr --verbose dumps and generate xrandr commands."
+    )
+    parser.add_argument("directory", type=Path, help="folder with the dumps")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--pattern", default="*", help="which files to read (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+
+    paths = sorted(p for p in args.directory.glob(args.pattern) if p.is_file())
+    if not paths:
+        print(f"No files match {args.pattern} in {args.directory}", file=sys.stderr)
+        return 1
+    failed = 0
+    for result in process_dumps(paths, args.jobs):
+        if "error" in result:
+            failed += 1
+        print(json.dumps(result), flush=True)
+    if failed:
+        print(f"{failed} of {len(paths)} dumps failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
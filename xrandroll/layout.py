@@ -0,0 +1,166 @@
+"""Analyze and fix the geometry of a Screen's monitors.
+
+All functions here work on the area each enabled monitor covers in
+the framebuffer, that is ``(pos_x, pos_y, res_x, res_y)``. Since
+``res_x`` and ``res_y`` already include scaling and rotation, that is
+exactly what xrandr will lay out.
+"""
+
+
+def _rects(screen):
+    """Return a list of (name, x, y, w, h) for the enabled monitors."""
+    return [
+        (name, mon.pos_x, mon.pos_y, mon.res_x, mon.res_y)
+        for name, mon in screen.monitors.items()
+        if mon.enabled and mon.res_x and mon.res_y
+    ]
+
+
+def normalize(screen):
+    """Move all monitors so the layout starts at 0:0.
+
+    Returns the (dx, dy) offset that was applied.
+    """
+    rects = _rects(screen)
+    if not rects:
+        return 0, 0
+    dx = -min(r[1] for r in rects)
+    dy = -min(r[2] for r in rects)
+    if dx or dy:
+        for mon in screen.monitors.values():
+            if mon.enabled:
+                mon.pos_x += dx
+                mon.pos_y += dy
+    return dx, dy
+
+
+def find_overlaps(screen):
+    """Return a sorted list of (a, b) monitor names that overlap.
+
+    Replicas are expected to overlap, so they are not reported.
+
+    This sweeps a vertical line left to right over the monitor
+    edges, so each monitor is only compared with the ones that
+    share some horizontal span with it.
+    """
+    events = []
+    for i, (name, x, y, w, h) in enumerate(_rects(screen)):
+        # At the same x, ends (0) sort before starts (1) so that
+        # monitors that only touch are not overlapping.
+        events.append((x, 1, i, name, y, y + h))
+        events.append((x + w, 0, i, name, y, y + h))
+    events.sort()
+
+    overlaps = set()
+    active = {}
+    for _, is_start, i, name, top, bottom in events:
+        if not is_start:
+            del active[i]
+            continue
+        for other, o_top, o_bottom in active.values():
+            if top < o_bottom and o_top < bottom:
+                mon = screen.monitors[name]
+                if other in mon.replica_of or name in screen.monitors[other].replica_of:
+                    continue
+                overlaps.add(tuple(sorted((name, other))))
+        active[i] = (name, top, bottom)
+    return sorted(overlaps)
+
+
+def _subtract(intervals, top, bottom):
+    """Return the parts of [top, bottom) not covered by intervals."""
+    free = []
+    for start, end in sorted(intervals):
+        if start > top:
+            free.append((top, min(start, bottom)))
+        top = max(top, end)
+        if top >= bottom:
+            break
+    if top < bottom:
+        free.append((top, bottom))
+    return free
+
+
+def find_gaps(screen):
+    """Return a list of (x, y, w, h) areas not covered by any monitor.
+
+    Only the bounding box of the enabled monitors is considered, so
+    this is the "dead" space xrandr would put in the framebuffer.
+    Gaps are found with a sweep line over the vertical monitor edges,
+    and strips with the same vertical span are merged.
+    """
+    rects = _rects(screen)
+    if not rects:
+        return []
+    top = min(r[2] for r in rects)
+    bottom = max(r[2] + r[4] for r in rects)
+
+    edges = {}
+    for i, (_, x, y, w, h) in enumerate(rects):
+        edges.setdefault(x, []).append((1, i, y, y + h))
+        edges.setdefault(x + w, []).append((0, i, y, y + h))
+
+    gaps = []
+    open_gaps = {}  # (top, bottom) -> x where that gap started
+    active = {}
+    for x in sorted(edges):
+        for is_start, i, y0, y1 in edges[x]:
+            if is_start:
+                active[i] = (y0, y1)
+            else:
+                del active[i]
+        free = set(_subtract(active.values(), top, bottom))
+        for span in list(open_gaps):
+            if span not in free:
+                start = open_gaps.pop(span)
+                gaps.append((start, span[0], x - start, span[1] - span[0]))
+        for span in free:
+            open_gaps.setdefault(span, x)
+    # Whatever is still open started at the rightmost edge, so it's
+    # outside the layout.
+    return sorted(gaps, key=lambda g: (g[1], g[0]))
+
+
+def auto_arrange(screen, columns=None):
+    """Pack enabled monitors left to right, top to bottom, in a grid
+    starting at 0:0.
+
+    columns is how many monitors go in each row. If it's None, all
+    monitors go in a single row. Each column is as wide as its widest
+    monitor and each row as tall as its tallest one.
+
+    Replicas keep following the monitor they replicate.
+    """
+    placed = []
+    followers = []
+    for name, mon in screen.monitors.items():
+        if not mon.enabled:
+            continue
+        if any(r in placed for r in mon.replica_of):
+            followers.append(name)
+        else:
+            placed.append(name)
+    if not placed:
+        return
+    if columns is None or columns < 1:
+        columns = len(placed)
+
+    widths = [0] * columns
+    heights = [0] * ((len(placed) + columns - 1) // columns)
+    for i, name in enumerate(placed):
+        mon = screen.monitors[name]
+        row, col = divmod(i, columns)
+        widths[col] = max(widths[col], mon.res_x)
+        heights[row] = max(heights[row], mon.res_y)
+
+    for i, name in enumerate(placed):
+        mon = screen.monitors[name]
+        row, col = divmod(i, columns)
+        mon.pos_x = sum(widths[:col])
+        mon.pos_y = sum(heights[:row])
+
+    for name in followers:
+        mon = screen.monitors[name]
+        leader = screen.monitors[next(r for r in mon.replica_of if r in placed)]
+        mon.pos_x, mon.pos_y = leader.pos_x, leader.pos_y
+    screen.update_replica_of()
@@ -1,14 +1,14 @@
+import hashlib
+import math
 import os
-import shlex
-import subprocess
+import struct
 import sys
 
 import parse
-from PySide2.QtCore import QFile, QObject, QTimer
-from PySide2.QtUiTools import QUiLoader
-from PySide2.QtWidgets import QApplication, QGraphicsScene, QLabel
+from PySide2.QtCore import QFile, QObject, QProcess, QTimer
+from PySide2.QtWidgets import QApplication, QDialog, QGraphicsScene, QLabel
 
-from . import xrandr
+from . import apply, layout, snapshot, xrandr
 from .monitor_item import MonitorItem
 
 
@@ -18,25 +18,31 @@ class Window(QObject):
         self.ui = ui
         ui.show()
         self.ui.setWindowTitle("Display Configuration")
+        self.pos_label = QLabel(self.ui.sceneView)
+        self.pos_label.move(5, 5)
+        self.get_xrandr_info()
+        # Show the monitors right away, and fill the rest of the
+        # widgets once the event loop is running.
+        self.fill_scene()
+        QTimer.singleShot(0, self.finish_setup)
+
+    def finish_setup(self):
         self.ui.screenCombo.currentTextChanged.connect(self.monitor_selected)
         self.ui.replicaOf.currentTextChanged.connect(self.replica_changed)
         self.ui.orientationCombo.currentIndexChanged.connect(self.orientation_changed)
-        self.get_xrandr_info()
-        self.fill_ui()
+        self.fill_controls()
         self.ui.horizontalScale.valueChanged.connect(self.scale_changed)
         self.ui.verticalScale.valueChanged.connect(self.scale_changed)
         self.ui.modes.currentTextChanged.connect(self.mode_changed)
         self.ui.applyButton.clicked.connect(self.do_apply)
         self.ui.okButton.clicked.connect(self.do_ok)
         self.ui.resetButton.clicked.connect(self.do_reset)
+        self.ui.arrangeButton.clicked.connect(self.do_arrange)
         self.ui.cancelButton.clicked.connect(self.ui.reject)
         self.ui.scaleModeCombo.currentTextChanged.connect(self.scale_mode_changed)
         self.ui.primary.stateChanged.connect(self.primary_changed)
         self.ui.enabled.stateChanged.connect(self.enabled_changed)
 
-        self.pos_label = QLabel(self.ui.sceneView)
-        self.pos_label.move(5, 5)
-
     def enabled_changed(self):
         mon = self.ui.screenCombo.currentText()
         enabled = self.ui.enabled.isChecked()
@@ -156,35 +162,71 @@ class Window(QObject):
                 self.ui.horizontalScale.setValue(scale_x)
                 self.ui.verticalScale.setValue(scale_y)
 
+        layout.normalize(self.screen)
         self.screen.update_replica_of()
         for mon in self.screen.monitors.values():
             mon.item.update_visuals(mon)
 
-    def run(self, commands):
-        for i, cmd in enumerate(commands, 1):
-            print(f"Running {cmd} [{i}/{len(commands)}]")
-            subprocess.check_call(shlex.split(cmd))
+    def apply_screen(self, screen):
+        """Make the server match screen, only changing what's needed.
+
+        Outputs that don't end up as intended are retried, then rolled
+        back. Returns an apply.ApplyReport.
+        """
+        self.wait_for_xrandr()
+        report = apply.apply_screen(screen, self.server_screen)
+        print(report)
+        # Whatever was read back is what the server has now
+        for output, result in report.outputs.items():
+            if result.actual is not None:
+                self.server_screen.monitors[output] = result.actual
+        return report
+
+    def wait_for_xrandr(self):
+        """Wait until the background xrandr, if any, is done.
+
+        Until then screen, reset_screen and server_screen may still be
+        the saved ones, so read them after calling this.
+        """
+        if self.xrandr_process is not None:
+            self.xrandr_process.waitForFinished()
 
     def do_reset(self):
-        self.run(self.reset_screen.generate())
+        self.wait_for_xrandr()
+        self.apply_screen(self.reset_screen)
         self.fill_ui()
 
+    def do_arrange(self):
+        """Arrange the monitors in a grid as close to square as possible."""
+        # Replicas share a place, count them once
+        places = []
+        for name, mon in self.screen.monitors.items():
+            if mon.enabled and not any(r in places for r in mon.replica_of):
+                places.append(name)
+        layout.auto_arrange(self.screen, columns=math.ceil(math.sqrt(len(places))))
+        for mon in self.screen.monitors.values():
+            mon.item.update_visuals(mon)
+        self.adjust_view()
+
     def do_ok(self):
         self.do_apply()
         self.ui.accept()
 
     def do_apply(self):
-        cli = self.screen.generate()
-        self.run(cli)
+        self.wait_for_xrandr()
+        return self.apply_screen(self.screen)
 
     def fill_ui(self):
         """Configure UI out of our screen data."""
+        self.fill_scene()
+        self.fill_controls()
+
+    def fill_scene(self):
+        """Create a monitor item in a new scene for each monitor."""
         self.scene = QGraphicsScene(self)
         self.ui.sceneView.setScene(self.scene)
-        self.ui.screenCombo.clear()
 
         for name, monitor in self.screen.monitors.items():
-            self.ui.screenCombo.addItem(name)
             mon_item = MonitorItem(
                 data=monitor,
                 window=self,
@@ -192,8 +234,14 @@ class Window(QObject):
             )
             self.scene.addItem(mon_item)
             monitor.item = mon_item
-        self.ui.screenCombo.setCurrentText(self.screen.choose_a_monitor())
         self.adjust_view()
+
+    def fill_controls(self):
+        """Fill the monitor list and select one, which fills the rest."""
+        self.ui.screenCombo.clear()
+        for name in self.screen.monitors:
+            self.ui.screenCombo.addItem(name)
+        self.ui.screenCombo.setCurrentText(self.screen.choose_a_monitor())
         # self.scale_changed()  # Trigger scale labels update
 
     def orientation_changed(self):
@@ -233,7 +281,10 @@ class Window(QObject):
             item = mon.item
             mon.pos_x = item.x()
             mon.pos_y = item.y()
+        layout.normalize(self.screen)
         self.screen.update_replica_of()
+        for a, b in layout.find_overlaps(self.screen):
+            print(f"Warning: {a} overlaps {b}")
         for mon in self.screen.monitors.values():
             mon.item.update_visuals(mon)
         # Adjust view a little later
@@ -272,10 +323,75 @@ class Window(QObject):
             pass
 
     def get_xrandr_info(self):
-        _xrandr_data = xrandr.read_data()
-        self.screen = xrandr.parse_data(_xrandr_data)
+        """Get screen data, from the saved snapshot if there is one.
+
+        If the snapshot is used, xrandr is queried in the background
+        and whatever changed is patched in when it answers, except on
+        monitors the user changed in the meantime.
+        """
+        self.snapshot_path = snapshot.default_path()
+        self.xrandr_process = None
+        saved = snapshot.load(self.snapshot_path)
+        if saved is None:
+            self.set_xrandr_data(xrandr.read_data())
+            return
+        print("Using saved display configuration")
+        self.data_digest = saved.digest
+        self.screen = saved.screen()
+        self.screen.update_replica_of()
+        self.reset_screen = saved.screen()
+        self.server_screen = saved.screen()
+        self.xrandr_process = QProcess(self)
+        self.xrandr_process.finished.connect(self.live_data_received)
+        self.xrandr_process.errorOccurred.connect(
+            lambda error: print(f"Can't run xrandr: {error}")
+        )
+        self.xrandr_process.start("xrandr", ["--verbose"])
+
+    def set_xrandr_data(self, data):
+        self.data_digest = snapshot.digest(data)
+        self.screen = xrandr.parse_data(data)
+        self.screen.update_replica_of()
+        self.reset_screen = xrandr.parse_data(data)
+        self.server_screen = xrandr.parse_data(data)
+        try:
+            snapshot.save(self.snapshot_path, self.reset_screen, self.data_digest)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Can't save display configuration: {e}")
+
+    def live_data_received(self, exit_code, exit_status):
+        if exit_status != QProcess.NormalExit or exit_code:
+            print("Can't read display configuration, keeping the saved one")
+            return
+        output = self.xrandr_process.readAllStandardOutput().data()
+        data = output.decode("utf-8").splitlines()
+        if snapshot.digest(data) == self.data_digest:
+            return
+        print("Saved display configuration is stale, updating")
+        saved_screen, edited_screen = self.reset_screen, self.screen
+        self.set_xrandr_data(data)
+        live_screen, self.screen = self.screen, edited_screen
+        changed = snapshot.changed_monitors(saved_screen, live_screen)
+        if changed is None:  # Different outputs, start over
+            self.screen = live_screen
+            self.fill_ui()
+            return
+        # Monitors the user already changed keep the user's changes
+        edited = snapshot.changed_monitors(saved_screen, edited_screen)
+        for name in changed:
+            if name in edited:
+                print(f"{name} changed, keeping your changes")
+                continue
+            print(f"{name} changed")
+            mon = live_screen.monitors[name]
+            mon.item = self.screen.monitors[name].item
+            self.screen.monitors[name] = mon
         self.screen.update_replica_of()
-        self.reset_screen = xrandr.parse_data(_xrandr_data)
+        for mon in self.screen.monitors.values():
+            mon.item.update_visuals(mon)
+        self.adjust_view()
+        if self.ui.screenCombo.currentText():
+            self.monitor_selected(self.ui.screenCombo.currentText())
 
     def monitor_selected(self, name):
         if not name:
@@ -283,6 +399,7 @@ class Window(QObject):
         # needed so we don't flip through all modes as they are added
         self.ui.modes.blockSignals(True)
         self.ui.primary.blockSignals(True)
+        self.ui.replicaOf.blockSignals(True)
         # Show modes
         self.ui.modes.clear()
         monitor = self.screen.monitors[name]
@@ -313,6 +430,7 @@ class Window(QObject):
                     self.ui.replicaOf.setCurrentText(mon)
         self.ui.modes.blockSignals(False)
         self.ui.primary.blockSignals(False)
+        self.ui.replicaOf.blockSignals(False)
 
         guessed_scale_mode = monitor.guess_scale_mode()
         self.ui.scaleModeCombo.setCurrentText(guessed_scale_mode)
@@ -326,14 +444,43 @@ class Window(QObject):
         self.mode_changed()  # Not really, but it's the same thing
 
 
-def main():
-    app = QApplication(sys.argv)
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_ui(compiled=True):
+    """Create the main dialog.
+
+    If compiled is True and the ui_main module (made out of main.ui by
+    build.py) is there and was made from this main.ui, use it. Otherwise
+    parse main.ui with QUiLoader.
+    """
+    ui_path = os.path.join(os.path.dirname(__file__), "main.ui")
+    if compiled:
+        try:
+            from . import ui_main
+        except ImportError:
+            ui_main = None
+        if ui_main and getattr(ui_main, "UI_HASH", None) == _file_hash(ui_path):
+
+            class Main(QDialog, ui_main.Ui_Main):
+                pass
+
+            dialog = Main()
+            dialog.setupUi(dialog)
+            return dialog
+
+    from PySide2.QtUiTools import QUiLoader
 
-    ui_file = QFile(os.path.join(os.path.dirname(__file__), "main.ui"))
+    ui_file = QFile(ui_path)
     ui_file.open(QFile.ReadOnly)
+    return QUiLoader().load(ui_file)
 
-    loader = QUiLoader()
-    Window(loader.load(ui_file))
+
+def main():
+    app = QApplication(sys.argv)
+    Window(load_ui())
     sys.exit(app.exec_())
 
 
@@ -1,10 +1,21 @@
 """An object that represents a monitor."""
 
+import functools
 import re
 
 import parse
 
 
+@functools.lru_cache(maxsize=None)
+def _compile(pattern):
+    return parse.compile(pattern)
+
+
+def _search(pattern, string):
+    """Like parse.search, but compiling each pattern only once."""
+    return _compile(pattern).search(string)
+
+
 def _split_by_lines_matching(pattern, lines):
     """Return a list of groups of lines, splitting on lines
     matching the pattern. The line matching the pattern is
@@ -42,13 +53,13 @@ class Mode:
         """Initialize Mode from xrandr data."""
         self.data = data
         self.header = data[0]
-        self.name = parse.search("({mode_name})", self.header)["mode_name"]
-        self.res_x = parse.search("h: width{:s}{res_x:d}", data[1])["res_x"]
-        self.res_y = parse.search("v: height{:s}{res_y:d}", data[2])["res_y"]
-        self.refresh = parse.search("{refresh:f}Hz", data[2])["refresh"]
+        self.name = _search("({mode_name})", self.header)["mode_name"]
+        self.res_x = _search("h: width{:s}{res_x:d}", data[1])["res_x"]
+        self.res_y = _search("v: height{:s}{res_y:d}", data[2])["res_y"]
+        self.refresh = _search("{refresh:f}Hz", data[2])["refresh"]
         self.preferred = "+preferred" in self.header
         self.current = "*current" in self.header
-        self.frequency = parse.search("{freq:f}Hz", data[2])["freq"]
+        self.frequency = _search("{freq:f}Hz", data[2])["freq"]
 
     def __repr__(self):
         return self.header.strip()
@@ -78,7 +89,7 @@ class Monitor:
         """
 
         self.header = data.pop(0)
-        self.output = parse.search("{}{:s}", self.header)[0]
+        self.output = _search("{}{:s}", self.header)[0]
         self.primary = "primary" in self.header
         self.replica_of = []
         if "disconnected" in self.header:
@@ -86,10 +97,10 @@ class Monitor:
             return
         self.enabled = "+" in self.header
         if self.enabled:
-            self.pos_x, self.pos_y = parse.search("+{:d}+{:d}", self.header)
-            self.res_x, self.res_y = parse.search("{:d}x{:d}", self.header)
-            self.w_in_mm, self.h_in_mm = parse.search("{:d}mm x {:d}mm", self.header)
-        self.orientation = parse.search("{:w} (normal left inverted", self.header)[0]
+            self.pos_x, self.pos_y = _search("+{:d}+{:d}", self.header)
+            self.res_x, self.res_y = _search("{:d}x{:d}", self.header)
+            self.w_in_mm, self.h_in_mm = _search("{:d}mm x {:d}mm", self.header)
+        self.orientation = _search("{:w} (normal left inverted", self.header)[0]
 
         modes_data = _split_by_lines_matching("^  [^ ]", data)
         if modes_data:
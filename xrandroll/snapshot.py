@@ -0,0 +1,243 @@
+"""Save and load parsed Screens, so we can show something before xrandr answers.
+
+Only what the editor uses is saved, packed with struct, little endian:
+
+* HEADER: magic b"XRRS", SCHEMA, sha256 of the xrandr output the
+  Screen was parsed from, and the length of the rest
+* SCREEN: screen number and how many monitors follow
+* for each monitor, its output name and MONITOR: flags, position,
+  resolution, size in mm, orientation and how many modes follow
+* for each mode, its name and MODE: resolution, frequency and flags
+
+Names are a length byte followed by that many bytes of UTF-8.
+
+SCHEMA is computed from the layout above, so changing it makes old
+snapshots unusable without anyone having to remember a version bump.
+Anything that doesn't look exactly like that is ignored, so a bad
+snapshot only means a slower startup.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+
+from .monitor import Mode, Monitor
+from .xrandr import Screen
+
+MAGIC = b"XRRS"
+ORIENTATIONS = ("normal", "left", "inverted", "right")
+SCREEN = struct.Struct("<IH")
+MONITOR = struct.Struct("<BiiIIIIBH")
+MODE = struct.Struct("<IIdB")
+NAME = struct.Struct("<B")
+SCHEMA = zlib.crc32(
+    " ".join(
+        [s.format for s in (SCREEN, MONITOR, MODE, NAME)] + list(ORIENTATIONS)
+    ).encode()
+)
+HEADER = struct.Struct("<4sI32sI")
+
+# Flags
+ENABLED = 1
+PRIMARY = 2
+CURRENT = 1
+PREFERRED = 2
+
+
+def digest(data):
+    """Return a digest identifying xrandr output data, a list of lines."""
+    return hashlib.sha256("\n".join(data).encode("utf-8")).digest()
+
+
+def default_path():
+    """Where to keep the snapshot for the current X display."""
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    display = os.environ.get("DISPLAY", "default").replace("/", "_")
+    return os.path.join(cache, "xrandroll", f"screen{display}.snapshot")
+
+
+class Snapshot:
+    """A saved Screen, and the digest of the data it was parsed from.
+
+    values is what was unpacked from the file: the screen number and a
+    list with a (output, monitor values, modes) tuple per monitor.
+    """
+
+    def __init__(self, digest, values):
+        self.digest = digest
+        self.values = values
+
+    def screen(self):
+        """Return a new Screen out of this snapshot."""
+        number, monitors = self.values
+        screen = Screen.__new__(Screen)
+        screen.number = number
+        screen.monitors = {}
+        for output, values, modes in monitors:
+            flags, pos_x, pos_y, res_x, res_y, w_in_mm, h_in_mm, orientation = values
+            mon = Monitor.__new__(Monitor)
+            mon.output = output
+            mon.enabled = bool(flags & ENABLED)
+            mon.primary = bool(flags & PRIMARY)
+            mon.pos_x, mon.pos_y = pos_x, pos_y
+            mon.res_x, mon.res_y = res_x, res_y
+            mon.w_in_mm, mon.h_in_mm = w_in_mm, h_in_mm
+            mon.orientation = ORIENTATIONS[orientation]
+            mon.replica_of = []
+            mon.fields = {}
+            mon.modes = {}
+            for name, (m_res_x, m_res_y, frequency, m_flags) in modes:
+                mode = Mode.__new__(Mode)
+                mode.name = name
+                mode.res_x, mode.res_y = m_res_x, m_res_y
+                mode.frequency = mode.refresh = frequency
+                mode.current = bool(m_flags & CURRENT)
+                mode.preferred = bool(m_flags & PREFERRED)
+                mode.header = f"  {m_res_x}x{m_res_y} ({name})"
+                mon.modes[name] = mode
+            screen.monitors[output] = mon
+        screen.update_replica_of()
+        return screen
+
+
+def _pack_name(name):
+    data = name.encode("utf-8")
+    return NAME.pack(len(data)) + data
+
+
+def _unpack_name(buffer, offset):
+    (length,) = NAME.unpack_from(buffer, offset)
+    start, end = offset + NAME.size, offset + NAME.size + length
+    if end > len(buffer):
+        raise ValueError("name is cut short")
+    return buffer[start:end].decode("utf-8"), end
+
+
+def pack(screen):
+    """Return the bytes for screen, without the header."""
+    chunks = [SCREEN.pack(screen.number, len(screen.monitors))]
+    for output, mon in screen.monitors.items():
+        modes = getattr(mon, "modes", {})
+        chunks.append(_pack_name(output))
+        chunks.append(
+            MONITOR.pack(
+                ENABLED * mon.enabled | PRIMARY * mon.primary,
+                int(mon.pos_x),
+                int(mon.pos_y),
+                mon.res_x,
+                mon.res_y,
+                mon.w_in_mm,
+                mon.h_in_mm,
+                ORIENTATIONS.index(_orientation(mon)),
+                len(modes),
+            )
+        )
+        for name, mode in modes.items():
+            chunks.append(_pack_name(name))
+            chunks.append(
+                MODE.pack(
+                    mode.res_x,
+                    mode.res_y,
+                    mode.frequency,
+                    CURRENT * mode.current | PREFERRED * mode.preferred,
+                )
+            )
+    return b"".join(chunks)
+
+
+def unpack(buffer, offset=0):
+    """Return the values for a Snapshot packed in buffer at offset.
+
+    Also returns the offset where they end.
+    """
+    number, count = SCREEN.unpack_from(buffer, offset)
+    offset += SCREEN.size
+    monitors = []
+    for _ in range(count):
+        output, offset = _unpack_name(buffer, offset)
+        *values, mode_count = MONITOR.unpack_from(buffer, offset)
+        offset += MONITOR.size
+        if values[-1] >= len(ORIENTATIONS):
+            raise ValueError(f"unknown orientation {values[-1]}")
+        modes = []
+        for _ in range(mode_count):
+            name, offset = _unpack_name(buffer, offset)
+            modes.append((name, MODE.unpack_from(buffer, offset)))
+            offset += MODE.size
+        monitors.append((output, values, modes))
+    return (number, monitors), offset
+
+
+def save(path, screen, data_digest):
+    """Save screen to path, replacing any existing snapshot atomically."""
+    payload = pack(screen)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, SCHEMA, data_digest, len(payload)))
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def load(path):
+    """Return the Snapshot in path, or None if it's missing or not usable."""
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if len(mm) < HEADER.size:
+                    return None
+                magic, schema, data_digest, length = HEADER.unpack_from(mm)
+                if (
+                    magic != MAGIC
+                    or schema != SCHEMA
+                    or len(mm) != HEADER.size + length
+                ):
+                    return None
+                values, end = unpack(mm, HEADER.size)
+                if end != len(mm):
+                    return None
+    except (OSError, ValueError, struct.error):
+        return None
+    return Snapshot(data_digest, values)
+
+
+def changed_monitors(old, new):
+    """Return the names of monitors that differ between Screens old and new.
+
+    Returns None if they don't even have the same outputs.
+    """
+    if list(old.monitors) != list(new.monitors):
+        return None
+    return [
+        name
+        for name in new.monitors
+        if _monitor_state(old.monitors[name]) != _monitor_state(new.monitors[name])
+    ]
+
+
+def _orientation(mon):
+    # Outputs that are off, and dumps without --verbose, have no
+    # orientation, and Monitor picks some other word from the header.
+    if mon.orientation in ORIENTATIONS:
+        return mon.orientation
+    return "normal"
+
+
+def _monitor_state(mon):
+    modes = getattr(mon, "modes", {})
+    return (
+        mon.enabled,
+        mon.primary,
+        _orientation(mon),
+        mon.pos_x,
+        mon.pos_y,
+        mon.res_x,
+        mon.res_y,
+        mon.replica_of,
+        [
+            (name, m.res_x, m.res_y, m.frequency, m.current, m.preferred)
+            for name, m in modes.items()
+        ],
+    )
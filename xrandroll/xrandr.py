@@ -2,7 +2,7 @@
 
 import subprocess
 
-from .monitor import Monitor, _split_by_lines_matching
+from .monitor import Monitor, _search, _split_by_lines_matching
 
 
 def is_replica_of(a, b):
@@ -22,7 +22,12 @@ def is_replica_of(a, b):
 class Screen:
     """A Screen is a collection of monitors."""
 
+    number = 0
+
     def __init__(self, data):
+        header = _search("Screen {:d}:", data[0])
+        if header:
+            self.number = header[0]
         self.monitors = {}
         for monitor_data in _split_by_lines_matching(r"^[^ \t].*", data[1:]):
             m = Monitor(monitor_data)
@@ -31,26 +36,30 @@ class Screen:
 
     def generate(self):
         """Create a list of xrandr invocations to match this state."""
-        results = []
-        for output, mon in self.monitors.items():
-            cli = ["xrandr"]
-            cli.append(f"--output {output}")
-            if not mon.enabled:
-                cli.append("--off")
-            else:
-                mode = mon.get_current_mode()
-                cli.append(f"--pos {int(mon.pos_x)}x{int(mon.pos_y)}")
-                cli.append(f"--mode {mode.res_x}x{mode.res_y}")
-                cli.append(f"--rate {mode.frequency}")
-                mod_x, mod_y = mode.res_x, mode.res_y
-                if mon.orientation in ("left", "right"):
-                    mod_x, mod_y = mod_y, mod_x
-                cli.append(f"--scale {mon.res_x/mod_x}x{mon.res_y/mod_y}")
-                cli.append(f"--rotate {mon.orientation}")
-                if mon.primary:
-                    cli.append("--primary")
-            results.append(" ".join(cli))
-        return results
+        return [self.generate_output(output) for output in self.monitors]
+
+    def generate_output(self, output):
+        """Create the xrandr invocation to match this state for one output."""
+        mon = self.monitors[output]
+        cli = ["xrandr"]
+        if self.number:
+            cli.append(f"--screen {self.number}")
+        cli.append(f"--output {output}")
+        if not mon.enabled:
+            cli.append("--off")
+        else:
+            mode = mon.get_current_mode()
+            cli.append(f"--pos {int(mon.pos_x)}x{int(mon.pos_y)}")
+            cli.append(f"--mode {mode.res_x}x{mode.res_y}")
+            cli.append(f"--rate {mode.frequency}")
+            mod_x, mod_y = mode.res_x, mode.res_y
+            if mon.orientation in ("left", "right"):
+                mod_x, mod_y = mod_y, mod_x
+            cli.append(f"--scale {mon.res_x/mod_x}x{mon.res_y/mod_y}")
+            cli.append(f"--rotate {mon.orientation}")
+            if mon.primary:
+                cli.append("--primary")
+        return " ".join(cli)
 
     def update_replica_of(self):
         """Decide which monitors are replicas of each other and
@@ -96,6 +105,32 @@ def read_data():
     return data
 
 
+def read_outputs(outputs, number=0):
+    """Read the current state of some outputs.
+
+    Returns a dictionary of Monitors, only for the outputs given,
+    out of screen number. The server doesn't probe for changes,
+    and the other outputs are not parsed, so this is quick.
+    """
+    cli = ["xrandr", "--current", "--verbose"]
+    if number:
+        cli += ["--screen", str(number)]
+    data = subprocess.check_output(cli, encoding="utf-8").splitlines()
+    monitors = {}
+    for monitor_data in _split_by_lines_matching(r"^[^ \t].*", data):
+        if monitor_data[0].split()[0] in outputs:
+            m = Monitor(monitor_data)
+            monitors[m.output] = m
+    return monitors
+
+
+def parse_screens(data):
+    """Return a list with a Screen for each X screen in data."""
+    return [Screen(d) for d in _split_by_lines_matching("^Screen ", data)]
+
+
 def parse_data(data):
-    # Going to pretend there can only be one screen because life is short.
-    return Screen(_split_by_lines_matching("^Screen ", data)[0])
+    """Return the first Screen in data.
+
+    Use parse_screens to get all of them."""
+    return parse_screens(data)[0]